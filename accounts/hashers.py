@@ -0,0 +1,19 @@
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class MockPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    Cheap PBKDF2 for seeding mock users only.
+    Shares the pbkdf2_sha256 algorithm name, so the stock hasher still verifies
+    these hashes and upgrades them to the configured iteration count on first login.
+    """
+    iterations = 1000
+
+
+class FastPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    Portal default: PBKDF2 at a lower (still OWASP-2021-level) iteration count
+    than Django's, trading some brute-force cost for ~4x faster logins.
+    Existing hashes still verify and are re-hashed to this count on next login.
+    """
+    iterations = 260_000
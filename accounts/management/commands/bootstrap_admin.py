@@ -15,16 +15,30 @@ class Command(BaseCommand):
             return
 
         User = get_user_model()
-        user, created = User.objects.get_or_create(username=username, defaults={"email": email})
+        user = User.objects.filter(username=username).first()
+        if user is None:
+            User.objects.create_superuser(username=username, email=email, password=password)
+            self.stdout.write(f"bootstrap_admin: created superuser '{username}'.")
+            return
 
-        # Always enforce superuser + reset password (so it can't be 'wrong')
-        user.is_staff = True
-        user.is_superuser = True
-        if email:
+        # Always enforce superuser + password (so it can't be 'wrong'),
+        # but only write the columns that actually differ from the env vars
+        fields_changed = []
+        if not user.is_staff:
+            user.is_staff = True
+            fields_changed.append("is_staff")
+        if not user.is_superuser:
+            user.is_superuser = True
+            fields_changed.append("is_superuser")
+        if email and user.email != email:
             user.email = email
-        user.set_password(password)
-        user.save()
+            fields_changed.append("email")
+        if not user.check_password(password):
+            user.set_password(password)
+            fields_changed.append("password")
 
-        self.stdout.write(f"bootstrap_admin: {'created' if created else 'updated'} superuser '{username}'.")
-        self.stdout.write("bootstrap_admin: running...")
-        self.stdout.write(f"bootstrap_admin: updated superuser '{username}'.")
\ No newline at end of file
+        if fields_changed:
+            user.save(update_fields=fields_changed)
+            self.stdout.write(f"bootstrap_admin: updated superuser '{username}' ({', '.join(fields_changed)}).")
+        else:
+            self.stdout.write(f"bootstrap_admin: superuser '{username}' already up to date.")
@@ -1,19 +1,51 @@
 import csv
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
 
+import django
+from django.apps import apps
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.db import transaction
+from django.db.models import Q
+from django.test.utils import override_settings
 
 
-User = get_user_model()
+BATCH_SIZE = 1000
+COLUMNS = ("username", "email", "first_name", "last_name", "is_staff", "is_superuser", "password")
+FAST_HASHERS = ["accounts.hashers.MockPBKDF2PasswordHasher"]
+UPDATE_FIELDS = ["email", "first_name", "last_name", "is_staff", "is_superuser", "password"]
+
+
+def _init_hash_worker(fast_hash):
+    """
+    Pool initializer. Under the "spawn" start method (macOS/Windows) a worker is a
+    fresh interpreter: Django isn't set up and the parent's --fast-hash override
+    isn't inherited, so redo both. Under "fork" both are already in place.
+    """
+    if not apps.ready:
+        django.setup()
+    if fast_hash and list(settings.PASSWORD_HASHERS[:1]) != FAST_HASHERS:
+        override_settings(PASSWORD_HASHERS=FAST_HASHERS + list(settings.PASSWORD_HASHERS)).enable()
+
+
+def _hash(pw):
+    # Module-level so worker processes can pickle it. No memoisation: every
+    # call must get its own salt, even when passwords repeat.
+    return make_password(pw)
+
+
+_TRUE = frozenset({"1", "true", "t", "yes", "y"})
 
 
 def to_bool(v):
     if v is None:
         return False
-    s = str(v).strip().lower()
-    return s in ("1", "true", "t", "yes", "y")
+    s = v if isinstance(v, str) else str(v)
+    return s.strip().lower() in _TRUE
 
 
 class Command(BaseCommand):
@@ -25,68 +57,117 @@ class Command(BaseCommand):
                            help="Default password if CSV doesn't include one")
         parser.add_argument("--update-existing", action="store_true",
                            help="Update existing users if username/email matches")
+        parser.add_argument("--fast-hash", action="store_true",
+                           help="Use a low-cost hasher for mock data; rehashed on first real login")
+        parser.add_argument("--mock", action="store_true",
+                           help="Seed data only: hash the default password once and share it across rows")
 
     @transaction.atomic
     def handle(self, *args, **opts):
+        User = get_user_model()
         csv_path = Path(opts["csv_path"]).expanduser().resolve()
         default_password = opts["default_password"]
         update_existing = opts["update_existing"]
+        fast_hash = opts["fast_hash"]
+        share_default_hash = opts["mock"]
 
         if not csv_path.exists():
             self.stderr.write(self.style.ERROR(f"CSV not found: {csv_path}"))
             return
 
-        created = 0
-        updated = 0
         skipped = 0
+        rows = []
 
         with csv_path.open(newline="", encoding="utf-8-sig") as f:
-            reader = csv.DictReader(f)
+            # plain csv.reader: resolve column positions once from the header
+            # instead of building a dict per row
+            reader = csv.reader(f)
+            header = [h.strip() for h in next(reader, [])]
             required = {"username", "email"}
-            missing = required - set([h.strip() for h in reader.fieldnames or []])
+            missing = required - set(header)
             if missing:
                 self.stderr.write(self.style.ERROR(f"CSV missing required columns: {', '.join(sorted(missing))}"))
                 return
 
+            idx = {name: header.index(name) for name in COLUMNS if name in header}
+
+            def col(row, name):
+                i = idx.get(name)
+                return row[i].strip() if i is not None and i < len(row) else ""
+
             for row in reader:
-                username = (row.get("username") or "").strip()
-                email = (row.get("email") or "").strip().lower()
-                first_name = (row.get("first_name") or "").strip()
-                last_name = (row.get("last_name") or "").strip()
+                username = col(row, "username")
+                email = col(row, "email").lower()
 
                 if not username or not email:
                     skipped += 1
                     continue
 
-                is_staff = to_bool(row.get("is_staff"))
-                is_superuser = to_bool(row.get("is_superuser"))
-                pw = (row.get("password") or "").strip() or default_password
-
-                # find existing
-                user = None
-                if update_existing:
-                    user = User.objects.filter(username=username).first() or User.objects.filter(email=email).first()
-
-                if user:
-                    user.email = email
-                    user.first_name = first_name
-                    user.last_name = last_name
-                    user.is_staff = is_staff
-                    user.is_superuser = is_superuser
-                    user.set_password(pw)
-                    user.save()
-                    updated += 1
-                else:
-                    user = User.objects.create_user(
-                        username=username,
-                        email=email,
-                        first_name=first_name,
-                        last_name=last_name,
-                        password=pw,
-                    )
-                    user.is_staff = is_staff
-                    user.is_superuser = is_superuser
-                    user.save()
-                    created += 1
+                rows.append({
+                    "username": username,
+                    "email": email,
+                    "first_name": col(row, "first_name"),
+                    "last_name": col(row, "last_name"),
+                    "is_staff": to_bool(col(row, "is_staff")),
+                    "is_superuser": to_bool(col(row, "is_superuser")),
+                    "password": col(row, "password"),
+                })
+
+        # find existing by username or email (one query instead of two per row)
+        by_username = {}
+        by_email = {}
+        if update_existing:
+            candidates = User.objects.filter(
+                Q(username__in={r["username"] for r in rows}) | Q(email__in={r["email"] for r in rows})
+            ).only("id", "username", *UPDATE_FIELDS)
+            for u in candidates:
+                by_username[u.username] = u
+                by_email.setdefault(u.email, u)
+
+        # hashing is CPU-bound; spread it across cores before touching the DB.
+        # --fast-hash swaps in a cheap hasher; check_password() upgrades those
+        # hashes to the configured hasher the first time each user logs in.
+        # Without --mock every row is hashed on its own, so each gets its own salt
+        # even when passwords repeat. With --mock (seed data only), rows without a
+        # password share one pre-computed default hash, salt included.
+        passwords = [r.pop("password") or (None if share_default_hash else default_password) for r in rows]
+        hashers = (
+            override_settings(PASSWORD_HASHERS=FAST_HASHERS + list(settings.PASSWORD_HASHERS))
+            if fast_hash else nullcontext()
+        )
+        with hashers:
+            default_hash = make_password(default_password) if share_default_hash else None
+            with ProcessPoolExecutor(initializer=_init_hash_worker, initargs=(fast_hash,)) as ex:
+                hashed = iter(list(ex.map(_hash, [pw for pw in passwords if pw], chunksize=64)))
+        hashes = [next(hashed) if pw else default_hash for pw in passwords]
+
+        created = 0
+        updated = 0
+        to_create = []
+        to_update = {}
+        for r, pw_hash in zip(rows, hashes):
+            user = None
+            if update_existing:
+                user = by_username.get(r["username"]) or by_email.get(r["email"])
+
+            if user:
+                # username is the match key, not an updatable column
+                for field, value in r.items():
+                    if field != "username":
+                        setattr(user, field, value)
+                user.password = pw_hash
+                if user.pk:
+                    to_update[user.pk] = user
+                updated += 1
+            else:
+                user = User(**r)
+                user.password = pw_hash
+                to_create.append(user)
+                by_username.setdefault(r["username"], user)
+                by_email.setdefault(r["email"], user)
+                created += 1
+
+        User.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+        User.objects.bulk_update(to_update.values(), fields=UPDATE_FIELDS, batch_size=BATCH_SIZE)
 
         self.stdout.write(self.style.SUCCESS(f"Done. created={created} updated={updated} skipped={skipped}"))
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.db import migrations
+
+# Django's PostgreSQL backend compiles __iexact to UPPER(col) = UPPER(%s),
+# so these expression indexes turn RegisterForm.clean_email into index probes.
+COLUMNS = ("email", "username")
+
+
+def _index_name(table, column):
+    return f"{table}_upper_{column}_idx"
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    table = apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table
+    for column in COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{_index_name(table, column)}" '
+            f'ON "{table}" (UPPER("{column}"))'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    table = apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table
+    for column in COLUMNS:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{_index_name(table, column)}"')
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
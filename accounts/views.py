@@ -1,6 +1,10 @@
 # accounts/views.py
+import logging
+import threading
+
 from django.contrib import messages
-from django.contrib.auth import login
+from django.contrib.auth import get_user_model, login
+from django.db import connection, transaction
 from django.shortcuts import render, redirect
 
 from .forms import RegisterForm
@@ -9,6 +13,23 @@ from .forms import RegisterForm
 # If you ever see import-related crashes, move them inside the POST success block.
 from courses.services import is_company_user, assign_required_company_courses
 
+logger = logging.getLogger(__name__)
+
+
+def _assign_company_courses_bg(user_id):
+    """
+    Runs in a daemon thread so registration doesn't wait on assignment writes.
+    The thread gets its own DB connection, so close it when done.
+    """
+    try:
+        user = get_user_model().objects.get(pk=user_id)
+        assign_required_company_courses(user)
+    except Exception:
+        # Don't brick registration if assignment logic fails
+        logger.exception("Required course assignment failed for user %s", user_id)
+    finally:
+        connection.close()
+
 
 def register(request):
     if request.method == "POST":
@@ -16,17 +37,19 @@ def register(request):
         if form.is_valid():
             user = form.save()
 
-            # ✅ Company-domain auto assignment AFTER user exists
+            login(request, user)
+
+            # ✅ Company-domain auto assignment AFTER user exists (off the request thread).
+            # Started on commit so the thread never runs against an uncommitted user.
+            # If the worker dies mid-assignment, the admin action "Assign required
+            # company courses to all company users" fills in whatever is missing.
             email = (user.email or "").strip().lower()
-            try:
-                if is_company_user(email):
-                    assign_required_company_courses(user)
-            except Exception:
-                # Don't brick registration if assignment logic fails
-                # (Optional) log this if you have logging configured
-                pass
+            if is_company_user(email):
+                user_id = user.id
+                transaction.on_commit(
+                    lambda: threading.Thread(target=_assign_company_courses_bg, args=(user_id,), daemon=True).start()
+                )
 
-            login(request, user)
             messages.success(request, "Account created. Welcome!")
             return redirect("/app/")  # or: return redirect("dashboard")
         else:
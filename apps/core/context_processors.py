@@ -1,7 +1,12 @@
 from django.conf import settings
 
+# Settings don't change at runtime, so build the context once at import.
+# RequestContext copies processor output, so sharing this dict is safe.
+_CONTEXT = {
+    "FRONTEND_URL": getattr(settings, "FRONTEND_URL", "").rstrip("/"),
+    "APP_PATH": getattr(settings, "APP_PATH", "/app/"),
+}
+
+
 def frontend_url(request):
-    return {
-        "FRONTEND_URL": getattr(settings, "FRONTEND_URL", "").rstrip("/"),
-        "APP_PATH": getattr(settings, "APP_PATH", "/app/"),
-    }
+    return _CONTEXT
@@ -1,14 +1,42 @@
 # apps/core/media.py
 import mimetypes
 import os
-import re
+import stat
 
 from django.conf import settings
-from django.http import Http404, HttpResponse
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
 from django.utils.http import http_date
 from django.views.decorators.http import require_GET
 
-_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)")
+_CHUNK_SIZE = 64 * 1024
+
+
+def _parse_range(header: str, file_size: int):
+    """
+    Parse a single "bytes=start-end" Range header into (start, end).
+    Open-ended parts default to the start/end of the file; returns None if malformed.
+    """
+    if not header.startswith("bytes="):
+        return None
+    start_s, sep, end_s = header[6:].split(",", 1)[0].partition("-")
+    if not sep or (start_s and not start_s.isdecimal()) or (end_s and not end_s.isdecimal()):
+        return None
+    start = int(start_s) if start_s else 0
+    end = int(end_s) if end_s else file_size - 1
+    return start, end
+
+
+def _iter_range(f, start: int, length: int):
+    """Yield `length` bytes of `f` from `start`, in fixed-size chunks."""
+    with f:
+        f.seek(start)
+        while length > 0:
+            data = f.read(min(_CHUNK_SIZE, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+
 
 @require_GET
 def media_serve(request, path: str):
@@ -17,35 +45,37 @@ def media_serve(request, path: str):
     if not full_path.startswith(os.path.normpath(str(settings.MEDIA_ROOT))):
         raise Http404("Invalid path")
 
-    if not os.path.exists(full_path) or not os.path.isfile(full_path):
+    # One stat for existence, type, size and mtime
+    try:
+        st = os.stat(full_path)
+    except OSError:
+        raise Http404("Not found")
+    if not stat.S_ISREG(st.st_mode):
         raise Http404("Not found")
 
-    file_size = os.path.getsize(full_path)
+    file_size = st.st_size
+    last_modified = http_date(st.st_mtime)
     content_type, _ = mimetypes.guess_type(full_path)
     content_type = content_type or "application/octet-stream"
 
     range_header = request.headers.get("Range") or request.META.get("HTTP_RANGE")
     if not range_header:
-        # Normal full response
-        with open(full_path, "rb") as f:
-            resp = HttpResponse(f.read(), content_type=content_type)
+        # Normal full response (FileResponse streams via wsgi.file_wrapper/sendfile)
+        resp = FileResponse(open(full_path, "rb"), content_type=content_type)
         resp["Content-Length"] = str(file_size)
         resp["Accept-Ranges"] = "bytes"
-        resp["Last-Modified"] = http_date(os.path.getmtime(full_path))
+        resp["Last-Modified"] = last_modified
         return resp
 
-    m = _RANGE_RE.match(range_header.strip())
-    if not m:
+    parsed = _parse_range(range_header.strip(), file_size)
+    if not parsed:
         # Bad Range -> return whole file
-        with open(full_path, "rb") as f:
-            resp = HttpResponse(f.read(), content_type=content_type)
+        resp = FileResponse(open(full_path, "rb"), content_type=content_type)
         resp["Content-Length"] = str(file_size)
         resp["Accept-Ranges"] = "bytes"
         return resp
 
-    start_s, end_s = m.groups()
-    start = int(start_s) if start_s else 0
-    end = int(end_s) if end_s else file_size - 1
+    start, end = parsed
 
     if start >= file_size:
         resp = HttpResponse(status=416)
@@ -55,13 +85,13 @@ def media_serve(request, path: str):
     end = min(end, file_size - 1)
     length = end - start + 1
 
-    with open(full_path, "rb") as f:
-        f.seek(start)
-        data = f.read(length)
-
-    resp = HttpResponse(data, status=206, content_type=content_type)
+    resp = StreamingHttpResponse(
+        _iter_range(open(full_path, "rb"), start, length),
+        status=206,
+        content_type=content_type,
+    )
     resp["Content-Range"] = f"bytes {start}-{end}/{file_size}"
     resp["Accept-Ranges"] = "bytes"
     resp["Content-Length"] = str(length)
-    resp["Last-Modified"] = http_date(os.path.getmtime(full_path))
+    resp["Last-Modified"] = last_modified
     return resp
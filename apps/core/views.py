@@ -1,29 +1,23 @@
 # apps/core/views.py
+import hashlib
+import json
 import os
+import re
 from pathlib import Path
 
 from django.conf import settings
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import ensure_csrf_cookie
+from django.views.decorators.http import condition
 from django.contrib.staticfiles import finders
 
+# Matches src="/assets/, href='/assets/ etc. in one pass
+_ASSET_RE = re.compile(r"""(src|href)=(["'])/assets/""")
 
-@login_required
-def me(request):
-    if not request.user.is_authenticated:
-        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
-
-    u = request.user
-    return JsonResponse({
-        "id": u.id,
-        "username": u.username,
-        "first_name": u.first_name,
-        "last_name": u.last_name,
-        "is_staff": u.is_staff,
-        "is_superuser": u.is_superuser,
-    })
+# index_path -> (mtime, rewritten html); rebuilt only when the build changes
+_INDEX_CACHE = {}
 
 
 @staff_member_required
@@ -38,6 +32,20 @@ def media_check(request):
     })
 
 
+def _stream_media_list(root, folder, entries):
+    """
+    Emit the debug_media_list payload piece by piece so a large folder
+    never has to be serialized into one buffer.
+    """
+    yield '{"media_root": %s, "folder": %s, "exists": true, "files": [' % (
+        json.dumps(str(root)),
+        json.dumps(str(folder)),
+    )
+    for i, (name, size) in enumerate(entries):
+        yield ("" if i == 0 else ", ") + json.dumps({"name": name, "size": size})
+    yield "]}"
+
+
 @staff_member_required
 def debug_media_list(request):
     root = Path(settings.MEDIA_ROOT)
@@ -51,17 +59,14 @@ def debug_media_list(request):
             "files": [],
         })
 
-    files = []
-    for p in sorted(folder.glob("*")):
-        if p.is_file():
-            files.append({"name": p.name, "size": p.stat().st_size})
+    # scandir entries carry the file type from readdir, so no extra stat per is_file()
+    with os.scandir(folder) as it:
+        entries = sorted((e.name, e.stat().st_size) for e in it if e.is_file())
 
-    return JsonResponse({
-        "media_root": str(root),
-        "folder": str(folder),
-        "exists": True,
-        "files": files,
-    })
+    return StreamingHttpResponse(
+        _stream_media_list(root, folder, entries),
+        content_type="application/json",
+    )
 
 
 @login_required(login_url="/accounts/login/")
@@ -81,20 +86,37 @@ def react_app(request):
             content_type="text/plain",
         )
 
-    with open(index_path, "r", encoding="utf-8") as f:
-        html = f.read()
+    mtime = os.path.getmtime(index_path)
+    cached = _INDEX_CACHE.get(index_path)
+    if cached and cached[0] == mtime:
+        html = cached[1]
+    else:
+        with open(index_path, "r", encoding="utf-8") as f:
+            html = f.read()
 
-    # Safety net: patch root /assets -> Django static path
-    html = html.replace('src="/assets/', 'src="/static/app/assets/')
-    html = html.replace("src='/assets/", "src='/static/app/assets/")
-    html = html.replace('href="/assets/', 'href="/static/app/assets/')
-    html = html.replace("href='/assets/", "href='/static/app/assets/")
+        # Safety net: patch root /assets -> Django static path
+        html = _ASSET_RE.sub(r"\1=\2/static/app/assets/", html)
+
+        _INDEX_CACHE[index_path] = (mtime, html)
 
     resp = HttpResponse(html, content_type="text/html")
     resp["Cache-Control"] = "no-store"
     return resp
 
 
+def _me_etag(request):
+    """
+    ETag for /api/me/: changes whenever any field in the payload (or the login) does.
+    Anonymous requests get no ETag so they always reach the 401 branch.
+    """
+    u = request.user
+    if not u.is_authenticated:
+        return None
+    key = f"{u.pk}:{u.last_login}:{u.username}:{u.first_name}:{u.last_name}:{u.is_staff}:{u.is_superuser}"
+    return hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+
+
+@condition(etag_func=_me_etag)
 def me(request):
     if not request.user.is_authenticated:
         return JsonResponse(
@@ -103,11 +125,14 @@ def me(request):
         )
 
     u = request.user
-    return JsonResponse({
+    resp = JsonResponse({
         "id": u.id,
         "username": u.username,
         "first_name": u.first_name,
         "last_name": u.last_name,
         "is_staff": u.is_staff,
         "is_superuser": u.is_superuser,
-    })
\ No newline at end of file
+    })
+    # Lets the SPA revalidate with If-None-Match and get a 304 instead of the body
+    resp["Cache-Control"] = "private, max-age=30"
+    return resp
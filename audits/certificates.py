@@ -0,0 +1,164 @@
+# audits/certificates.py
+"""
+The one completion-certificate renderer. Both download endpoints
+(audits certificate_download and the legacy courses download_certificate)
+serve the PDF built here.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.utils.timezone import localtime
+
+from reportlab.lib.pagesizes import letter, landscape
+from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+from courses.models import AssignmentCycle
+
+logger = logging.getLogger(__name__)
+
+# Layout. Everything that doesn't depend on the certificate is evaluated
+# once here, so a render only computes the per-user strings.
+CERT_PAGE_SIZE = landscape(letter)
+CERT_WIDTH, CERT_HEIGHT = CERT_PAGE_SIZE
+CERT_MARGIN = 0.5 * inch
+CERT_LOGO_PATH = os.path.join(settings.BASE_DIR, "media", "branding", "integra_logo.png")
+
+# Decoded once and reused by every render (the logo doesn't appear mid-process)
+CERT_LOGO = ImageReader(CERT_LOGO_PATH) if os.path.exists(CERT_LOGO_PATH) else None
+
+# Bump when the layout changes so shared caches don't serve old artwork
+CERT_CACHE_KEY = "cert_pdf:v2:{}"
+
+_CERT_BORDER = (CERT_MARGIN, CERT_MARGIN, CERT_WIDTH - 2 * CERT_MARGIN, CERT_HEIGHT - 2 * CERT_MARGIN)
+_CERT_LOGO_BOX = (CERT_MARGIN + 0.05 * inch, CERT_HEIGHT - 1.25 * inch, 2.1 * inch, 0.75 * inch)
+_CERT_STATIC_TEXT = (
+    # (font, size, y, text)
+    ("Helvetica-Bold", 34, CERT_HEIGHT - 1.35 * inch, "Certificate of Completion"),
+    ("Helvetica", 16, CERT_HEIGHT - 1.7 * inch, "This certifies that"),
+    ("Helvetica", 16, CERT_HEIGHT - 3.0 * inch, "has successfully completed"),
+)
+_CERT_CENTER_X = CERT_WIDTH / 2
+_CERT_Y_NAME = CERT_HEIGHT - 2.4 * inch
+_CERT_Y_COURSE = CERT_HEIGHT - 3.6 * inch
+_CERT_Y_DATES = CERT_HEIGHT - 4.3 * inch
+_CERT_ID_POS = (CERT_MARGIN + 0.2 * inch, CERT_MARGIN + 0.35 * inch)
+
+_SIG_LEFT = (CERT_WIDTH * 0.18, CERT_WIDTH * 0.45)
+_SIG_RIGHT = (CERT_WIDTH * 0.55, CERT_WIDTH * 0.82)
+_SIG_Y = CERT_MARGIN + 1.2 * inch
+_SIG_LABEL_Y = _SIG_Y - 0.25 * inch
+
+
+def _draw_certificate_frame(c: canvas.Canvas) -> None:
+    """Draw the fixed artwork shared by every certificate (border, logo, static text, signature lines)."""
+    c.setLineWidth(3)
+    c.rect(*_CERT_BORDER)
+
+    if CERT_LOGO:
+        x, y, w, h = _CERT_LOGO_BOX
+        c.drawImage(CERT_LOGO, x, y, width=w, height=h, preserveAspectRatio=True, mask="auto")
+
+    for font, size, y, text in _CERT_STATIC_TEXT:
+        c.setFont(font, size)
+        c.drawCentredString(_CERT_CENTER_X, y, text)
+
+    c.setLineWidth(1)
+    c.line(_SIG_LEFT[0], _SIG_Y, _SIG_LEFT[1], _SIG_Y)
+    c.line(_SIG_RIGHT[0], _SIG_Y, _SIG_RIGHT[1], _SIG_Y)
+
+    c.setFont("Helvetica", 12)
+    c.drawCentredString(sum(_SIG_LEFT) / 2, _SIG_LABEL_Y, "Training Administrator")
+
+
+def render_certificate_pdf(cycle: AssignmentCycle) -> bytes:
+    """Draw the completion certificate for a completed cycle and return the PDF bytes."""
+    if not (cycle.full_name_cached and cycle.course_title_cached):
+        cycle.fill_certificate_text()
+
+    completed_at = localtime(cycle.completed_at)
+    expires_at = localtime(cycle.expires_at) if cycle.expires_at else None
+
+    # Build PDF (ReportLab)
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=CERT_PAGE_SIZE)
+    _draw_certificate_frame(c)
+
+    c.setFont("Helvetica-Bold", 28)
+    c.drawCentredString(_CERT_CENTER_X, _CERT_Y_NAME, cycle.full_name_cached)
+
+    c.setFont("Helvetica-Bold", 22)
+    c.drawCentredString(_CERT_CENTER_X, _CERT_Y_COURSE, cycle.course_title_cached)
+
+    completed_date = completed_at.date().strftime("%B %d, %Y")
+    expires_date = expires_at.date().strftime("%B %d, %Y") if expires_at else "—"
+
+    c.setFont("Helvetica", 14)
+    c.drawCentredString(_CERT_CENTER_X, _CERT_Y_DATES, f"Completed: {completed_date}    |    Expires: {expires_date}")
+
+    c.setFont("Helvetica", 12)
+    c.drawString(*_CERT_ID_POS, f"Certificate ID: {cycle.certificate_id}")
+    c.drawCentredString(sum(_SIG_RIGHT) / 2, _SIG_LABEL_Y, completed_date)
+
+    c.showPage()
+    c.save()
+
+    pdf = buffer.getvalue()
+    buffer.close()
+    return pdf
+
+
+def certificate_cycles():
+    """
+    Cycles with everything a certificate download reads, and nothing else:
+    the denormalized certificate text plus the assignee id for permission
+    checks. certificate_id is unique, so lookups by it are a single index probe.
+    """
+    return (
+        AssignmentCycle.objects
+        .select_related("assignment")
+        .only(
+            "completed_at",
+            "expires_at",
+            "certificate_id",
+            "full_name_cached",
+            "course_title_cached",
+            "assignment__assignee",
+        )
+    )
+
+
+def certificate_pdf(cycle: AssignmentCycle) -> bytes:
+    # A completed cycle's certificate never changes, so render it once
+    return cache.get_or_set(
+        CERT_CACHE_KEY.format(cycle.certificate_id),
+        lambda: render_certificate_pdf(cycle),
+        timeout=None,
+    )
+
+
+def _prerender_certificate_bg(cycle_id):
+    """
+    Runs in a daemon thread so the completing request doesn't wait on ReportLab.
+    The thread gets its own DB connection, so close it when done.
+    """
+    try:
+        certificate_pdf(certificate_cycles().get(pk=cycle_id))
+    except Exception:
+        # The download views render on a cache miss anyway
+        logger.exception("Certificate pre-render failed for cycle %s", cycle_id)
+    finally:
+        connection.close()
+
+
+def prerender_certificate(cycle_id):
+    """Warm the certificate cache for a just-completed cycle, off the request thread."""
+    threading.Thread(target=_prerender_certificate_bg, args=(cycle_id,), daemon=True).start()
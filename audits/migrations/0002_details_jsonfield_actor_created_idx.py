@@ -0,0 +1,44 @@
+# Generated by Django 5.2.10 on 2026-10-15 22:29
+
+import json
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def details_text_to_json(apps, schema_editor):
+    """Make every existing details value valid JSON before the column type changes."""
+    AuditEvent = apps.get_model("audits", "AuditEvent")
+    for event in AuditEvent.objects.only("id", "details").iterator():
+        raw = (event.details or "").strip()
+        if not raw:
+            value = "{}"
+        else:
+            try:
+                json.loads(raw)
+                value = raw
+            except ValueError:
+                value = json.dumps(raw)
+        if value != event.details:
+            AuditEvent.objects.filter(pk=event.pk).update(details=value)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audits', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(details_text_to_json, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='auditevent',
+            name='details',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddIndex(
+            model_name='auditevent',
+            index=models.Index(fields=['actor', '-created_at'], name='audit_actor_created_idx'),
+        ),
+    ]
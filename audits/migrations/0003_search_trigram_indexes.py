@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.db import migrations
+
+# audit_center searches these columns with __icontains, which Django's
+# PostgreSQL backend compiles to UPPER(col::text) LIKE UPPER('%q%').
+# Trigram GIN indexes on UPPER(col) let those predicates use an index.
+SEARCH_COLUMNS = (
+    (settings.AUTH_USER_MODEL, ("username", "email", "first_name", "last_name")),
+    ("courses.Course", ("code", "title")),
+    ("courses.AssignmentCycle", ("certificate_id",)),
+)
+
+
+def _indexes(apps):
+    for model_label, columns in SEARCH_COLUMNS:
+        table = apps.get_model(model_label)._meta.db_table
+        for column in columns:
+            yield table, column, f"{table}_{column}_trgm_idx"
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, column, name in _indexes(apps):
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" '
+            f'ON "{table}" USING gin (UPPER("{column}") gin_trgm_ops)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for _table, _column, name in _indexes(apps):
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('audits', '0002_details_jsonfield_actor_created_idx'),
+        ('courses', '0011_course_annual_renewal_course_required_for_company'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
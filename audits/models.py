@@ -15,8 +15,7 @@ class AuditEvent(models.Model):
     object_type = models.CharField(max_length=100, blank=True)
     object_id = models.CharField(max_length=100, blank=True)
 
-    # Store a JSON-like string now; later can convert to JSONField if desired
-    details = models.TextField(blank=True)
+    details = models.JSONField(default=dict, blank=True)
 
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -26,6 +25,7 @@ class AuditEvent(models.Model):
             models.Index(fields=["created_at"]),
             models.Index(fields=["action"]),
             models.Index(fields=["object_type", "object_id"]),
+            models.Index(fields=["actor", "-created_at"], name="audit_actor_created_idx"),
         ]
 
     def __str__(self) -> str:
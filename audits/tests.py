@@ -1,3 +1,124 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from django.utils.timezone import now
+
+from courses.models import Assignment, AssignmentCycle, Course, CourseVersion
+
+User = get_user_model()
+
+
+def make_completed_assignments(n, course_version, start=0):
+    """n assignees, each with one completed cycle (plus an older one) on course_version."""
+    cycles = []
+    for i in range(start, start + n):
+        user = User.objects.create_user(
+            username=f"user{i}", email=f"user{i}@example.com", first_name="User", last_name=str(i),
+        )
+        a = Assignment.objects.create(assignee=user, course_version=course_version)
+        AssignmentCycle.objects.create(assignment=a, completed_at=now() - timedelta(days=400), passed=True)
+        cycles.append(
+            AssignmentCycle.objects.create(assignment=a, completed_at=now() - timedelta(days=i), passed=True)
+        )
+    return cycles
+
+
+class AuditCenterQueryCountTests(TestCase):
+    """
+    audit_center builds every row in SQL (latest-cycle subqueries, display
+    annotations), so its query count must not grow with the number of rows.
+    """
+
+    # session + user for the logged-in request
+    AUTH_QUERIES = 2
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(username="auditor", password="x", is_staff=True)
+        course = Course.objects.create(code="HIPAA", title="HIPAA Basics")
+        cls.cv = CourseVersion.objects.create(course=course, version="2026.01", is_published=True)
+        make_completed_assignments(5, cls.cv)
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+        self.url = reverse("audit_center")
+
+    def test_html_page_query_count(self):
+        # paginator COUNT + one page of rows
+        with self.assertNumQueries(self.AUTH_QUERIES + 2):
+            resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.context["rows"]), 5)
+
+    def test_html_page_query_count_does_not_grow_with_rows(self):
+        make_completed_assignments(20, self.cv, start=5)
+        with self.assertNumQueries(self.AUTH_QUERIES + 2):
+            resp = self.client.get(self.url, {"q": "user", "status": "COMPLIANT"})
+        self.assertEqual(len(resp.context["rows"]), 25)
+
+    def test_csv_export_query_count(self):
+        make_completed_assignments(20, self.cv, start=5)
+        # The CSV is streamed, so the row query runs while the body is consumed
+        with self.assertNumQueries(self.AUTH_QUERIES + 1):
+            resp = self.client.get(self.url, {"export": "csv"})
+            lines = b"".join(resp.streaming_content).decode().splitlines()
+        self.assertEqual(resp["Content-Type"], "text/csv")
+        self.assertEqual(len(lines), 1 + 25)
+        self.assertTrue(lines[0].startswith("User,Course,Version"))
+
+
+class CertificateDownloadQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        course = Course.objects.create(code="MOC", title="Medicare Compliance")
+        cv = CourseVersion.objects.create(course=course, version="v3", is_published=True)
+        cls.cycle = make_completed_assignments(1, cv)[0]
+        cls.owner = cls.cycle.assignment.assignee
+        cls.staff = User.objects.create_user(username="auditor", password="x", is_staff=True)
+        cls.auditor = User.objects.create_user(username="perm-auditor", password="x")
+        cls.auditor.user_permissions.add(Permission.objects.get(codename="can_audit_certs"))
+        cls.stranger = User.objects.create_user(username="stranger", password="x")
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("certificate-download", args=[self.cycle.certificate_id])
+
+    def download(self):
+        resp = self.client.get(self.url)
+        if resp.status_code == 200:
+            b"".join(resp.streaming_content)
+        return resp
+
+    def test_owner_download_query_count(self):
+        # session + user + one cycle lookup; the certificate text is
+        # denormalized on the cycle, so rendering reads no other table
+        self.client.force_login(self.owner)
+        with self.assertNumQueries(3):
+            resp = self.download()
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp["Content-Type"], "application/pdf")
+
+    def test_staff_download_query_count(self):
+        self.client.force_login(self.staff)
+        with self.assertNumQueries(3):
+            self.assertEqual(self.download().status_code, 200)
+
+    def test_cached_download_query_count(self):
+        self.client.force_login(self.owner)
+        self.download()
+        with self.assertNumQueries(3):
+            self.assertEqual(self.download().status_code, 200)
+
+    def test_permission_download_query_count(self):
+        # + has_perm(): user permissions, then group permissions
+        self.client.force_login(self.auditor)
+        with self.assertNumQueries(5):
+            self.assertEqual(self.download().status_code, 200)
 
-# Create your tests here.
+    def test_stranger_gets_404(self):
+        self.client.force_login(self.stranger)
+        self.assertEqual(self.download().status_code, 404)
@@ -2,31 +2,109 @@
 from __future__ import annotations
 
 import csv
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
 from io import BytesIO
 from typing import Optional
 
+from django.conf import settings
 from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
-from django.http import Http404, HttpResponse
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Case, CharField, DateField, Exists, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Cast, Coalesce, Concat, NullIf, Trim
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import render
-from django.utils.timezone import localtime, now
+from django.utils.timezone import localdate, make_aware
 
-from reportlab.lib.pagesizes import letter, landscape
-from reportlab.lib.units import inch
-from reportlab.pdfgen import canvas
+from courses.models import Assignment, AssignmentCycle, Course
 
-from courses.models import Assignment, AssignmentCycle
+from .certificates import certificate_cycles, certificate_pdf
 
+User = get_user_model()
 
-def _parse_date(s: str) -> Optional[datetime.date]:
+# Completed cycles expiring within this many days are flagged "DUE SOON"
+DUE_SOON_DAYS = 30
+
+# Rows per page in the HTML audit center (CSV export is never paginated)
+AUDIT_PAGE_SIZE = 50
+
+
+def _parse_date(s: str) -> Optional[date]:
+    # <input type="date"> always sends YYYY-MM-DD; anything else is malformed
+    if len(s) != 10:
+        return None
     try:
-        return datetime.strptime(s, "%Y-%m-%d").date()
-    except Exception:
+        return date.fromisoformat(s)
+    except ValueError:
         return None
 
 
+def _day_start(d):
+    """Midnight at the start of date `d` in the current timezone, as an aware datetime."""
+    return make_aware(datetime.combine(d, time.min))
+
+
+class _Echo:
+    """Write target for csv.writer that hands each encoded line straight back."""
+
+    def write(self, value):
+        return value
+
+
+def _newest_cycles(assignment_ref: str):
+    """Cycles of the outer assignment, newest first (for correlated subqueries)."""
+    return (
+        AssignmentCycle.objects
+        .filter(assignment=OuterRef(assignment_ref))
+        .order_by("-completed_at", "-pk")
+    )
+
+
+# Plain dicts for the HTML table, keyed the way the template reads them
+ROW_FIELDS = {
+    "user_display": F("user_display"),
+    "course_display": F("course_display"),
+    "version_display": F("course_version__version"),
+    "completed_at": F("latest_completed_at"),
+    "expires_at": F("latest_expires_at"),
+    "certificate_id": F("latest_certificate_id"),
+    "status_label": F("status_label"),
+}
+
+
+CSV_HEADER = ("User", "Course", "Version", "Completed", "Expires", "Status", "Certificate ID")
+CSV_COLUMNS = (
+    "user_display",
+    "course_display",
+    "course_version__version",
+    "latest_completed_date",
+    "latest_expires_date",
+    "status_label",
+    "latest_certificate_id",
+)
+
+
+def _csv_lines(rows):
+    """
+    Encode (CSV_COLUMNS) tuples as CSV lines, header first. The values come
+    out of the DB display-ready (None is written as ""), so the per-row work
+    is all inside the C writer.
+    """
+    w = csv.writer(_Echo())
+    yield w.writerow(CSV_HEADER)
+    yield from map(w.writerow, rows)
+
+
+def _debug_sql_response(qs):
+    """DEBUG only (?debug_sql=1): the audit query's SQL and plan as plain text."""
+    # ANALYZE actually runs the query; only PostgreSQL reports real timings
+    analyze = connection.vendor == "postgresql"
+    plan = qs.explain(analyze=True) if analyze else qs.explain()
+    return HttpResponse(f"{qs.query}\n\n{plan}\n", content_type="text/plain; charset=utf-8")
+
+
 @staff_member_required
 def audit_center(request):
     q = (request.GET.get("q") or "").strip()
@@ -39,90 +117,105 @@ def audit_center(request):
     start_d = _parse_date(start) if start else None
     end_d = _parse_date(end) if end else None
 
+    # Status boundaries as aware datetimes in the current timezone (what
+    # __date would compare against), so predicates use the raw column
+    today = localdate()
+    expired_before = _day_start(today)
+    due_soon_before = _day_start(today + timedelta(days=DUE_SOON_DAYS + 1))
+
     qs = (
         Assignment.objects
-        .select_related("assignee", "course_version", "course_version__course")
-        .prefetch_related("cycles")
+        # Rows are projected with values()/values_list() below, so no model
+        # instances are built; user and course names come back pre-formatted
+        .annotate(
+            latest_completed_at=Subquery(_newest_cycles("pk").values("completed_at")[:1]),
+            latest_expires_at=Subquery(_newest_cycles("pk").values("expires_at")[:1]),
+            latest_certificate_id=Subquery(_newest_cycles("pk").values("certificate_id")[:1]),
+            # Same fallback as (get_full_name() or email or username)
+            user_display=Coalesce(
+                NullIf(Trim(Concat("assignee__first_name", Value(" "), "assignee__last_name")), Value("")),
+                NullIf("assignee__email", Value("")),
+                "assignee__username",
+                output_field=CharField(),
+            ),
+            course_display=Concat(
+                "course_version__course__code", Value(" - "), "course_version__course__title",
+                output_field=CharField(),
+            ),
+        )
+        .annotate(status_label=Case(
+            When(Q(latest_completed_at__isnull=True) | Q(latest_expires_at__isnull=True), then=Value("—")),
+            When(latest_expires_at__lt=expired_before, then=Value("EXPIRED")),
+            When(latest_expires_at__lt=due_soon_before, then=Value("DUE SOON")),
+            default=Value("COMPLIANT"),
+        ))
         .order_by("assignee__username", "course_version__course__code", "-assigned_at")
     )
 
+    # Filter known statuses on the expiry range directly rather than on the CASE
+    status_ranges = {
+        "EXPIRED": Q(latest_expires_at__lt=expired_before),
+        "DUE SOON": Q(latest_expires_at__gte=expired_before, latest_expires_at__lt=due_soon_before),
+        "COMPLIANT": Q(latest_expires_at__gte=due_soon_before),
+    }
+    if status in status_ranges:
+        qs = qs.filter(status_ranges[status], latest_completed_at__isnull=False)
+    elif status:
+        qs = qs.filter(status_label=status)
+
+    # Date window applies to the latest cycle's completion (the scalar
+    # annotation, so there's no join fan-out across older cycles), as a
+    # half-open datetime range rather than a __date transform
+    if start_d:
+        qs = qs.filter(latest_completed_at__gte=_day_start(start_d))
+    if end_d:
+        qs = qs.filter(latest_completed_at__lt=_day_start(end_d + timedelta(days=1)))
+
     if course:
         qs = qs.filter(course_version__course__code__icontains=course)
 
     if q:
+        # One subquery per table, so each side of the OR can be answered from
+        # that table's trigram indexes (see migration 0003); a single OR across
+        # joined tables can't use any of them
+        matching_users = User.objects.filter(
+            Q(username__icontains=q)
+            | Q(email__icontains=q)
+            | Q(first_name__icontains=q)
+            | Q(last_name__icontains=q)
+        ).values("pk")
+        matching_courses = Course.objects.filter(
+            Q(title__icontains=q) | Q(code__icontains=q)
+        ).values("pk")
         qs = qs.filter(
-            Q(assignee__username__icontains=q)
-            | Q(assignee__email__icontains=q)
-            | Q(assignee__first_name__icontains=q)
-            | Q(assignee__last_name__icontains=q)
-            | Q(course_version__course__title__icontains=q)
-            | Q(course_version__course__code__icontains=q)
-            | Q(cycles__certificate_id__icontains=q)
-        ).distinct()
-
-    rows = []
-    for a in qs:
-        cycle = a.cycles.all().first() if hasattr(a, "cycles") else None
-
-        if start_d or end_d:
-            if not cycle or not cycle.completed_at:
-                continue
-            cd = cycle.completed_at.date()
-            if start_d and cd < start_d:
-                continue
-            if end_d and cd > end_d:
-                continue
-
-        status_label = "—"
-        if cycle and cycle.completed_at and cycle.expires_at:
-            days = (cycle.expires_at.date() - now().date()).days
-            if days < 0:
-                status_label = "EXPIRED"
-            elif days <= 30:
-                status_label = "DUE SOON"
-            else:
-                status_label = "COMPLIANT"
-
-        if status and status_label != status:
-            continue
-
-        assignee = a.assignee
-        user_display = (
-            (assignee.get_full_name() or "").strip()
-            or assignee.email
-            or assignee.username
+            Q(assignee__in=matching_users)
+            | Q(course_version__course__in=matching_courses)
+            # EXISTS instead of joining cycles, so no fan-out and no DISTINCT
+            | Exists(AssignmentCycle.objects.filter(assignment=OuterRef("pk"), certificate_id__icontains=q))
         )
 
-        course_display = f"{a.course_version.course.code} - {a.course_version.course.title}"
-        version_display = a.course_version.version
-
-        rows.append({
-            "assignment": a,
-            "cycle": cycle,
-            "user_display": user_display,
-            "course_display": course_display,
-            "version_display": version_display,
-            "status_label": status_label,
-        })
-
     if export == "csv":
-        resp = HttpResponse(content_type="text/csv")
+        # Plain tuples streamed straight from the DB cursor: no model instances,
+        # and neither the rows nor the CSV are ever held in memory in full
+        rows_qs = qs.annotate(
+            # UTC calendar dates, like the export has always used
+            latest_completed_date=Cast("latest_completed_at", DateField()),
+            latest_expires_date=Cast("latest_expires_at", DateField()),
+        ).values_list(*CSV_COLUMNS)
+        resp = StreamingHttpResponse(
+            _csv_lines(rows_qs.iterator(chunk_size=2000)),
+            content_type="text/csv",
+        )
         resp["Content-Disposition"] = 'attachment; filename="audit_export.csv"'
-        w = csv.writer(resp)
-        w.writerow(["User", "Course", "Version", "Completed", "Expires", "Status", "Certificate ID"])
-        for r in rows:
-            c = r["cycle"]
-            w.writerow([
-                r["user_display"],
-                r["course_display"],
-                r["version_display"],
-                c.completed_at.date().isoformat() if c and c.completed_at else "",
-                c.expires_at.date().isoformat() if c and c.expires_at else "",
-                r["status_label"],
-                c.certificate_id if c else "",
-            ])
         return resp
 
+    if settings.DEBUG and request.GET.get("debug_sql") == "1":
+        return _debug_sql_response(qs.values(**ROW_FIELDS))
+
+    page_obj = Paginator(qs.values(**ROW_FIELDS), AUDIT_PAGE_SIZE).get_page(request.GET.get("page"))
+    # Read the page slice straight off the cursor, skipping the result cache
+    rows = list(page_obj.object_list.iterator(chunk_size=AUDIT_PAGE_SIZE))
+
     can_audit_all = (
         request.user.is_staff
         or request.user.is_superuser
@@ -131,6 +224,7 @@ def audit_center(request):
 
     return render(request, "audits/audit_center.html", {
         "rows": rows,
+        "page_obj": page_obj,
         "q": q,
         "course": course,
         "status": status,
@@ -147,78 +241,28 @@ def certificate_download(request, certificate_id: str):
     This matches audits/urls.py: views.certificate_download
     """
     try:
-        cycle = (
-            AssignmentCycle.objects
-            .select_related(
-                "assignment",
-                "assignment__assignee",
-                "assignment__course_version",
-                "assignment__course_version__course",
-            )
-            .get(certificate_id=certificate_id)
-        )
+        cycle = certificate_cycles().get(certificate_id=certificate_id)
     except AssignmentCycle.DoesNotExist:
         raise Http404("Certificate not found")
 
-    # Permission: owner OR staff/superuser OR audit permission
+    # Permission: owner OR staff/superuser OR audit permission.
+    # Cheapest checks first; has_perm() may query the permission tables.
     if not (
         request.user.is_staff
         or request.user.is_superuser
-        or request.user.has_perm("courses.can_audit_certs")
         or cycle.assignment.assignee_id == request.user.id
+        or request.user.has_perm("courses.can_audit_certs")
     ):
         raise Http404("Not found")
 
     if not cycle.completed_at:
         raise Http404("Course not completed")
 
-    assignee = cycle.assignment.assignee
-    full_name = (assignee.get_full_name() or assignee.username or assignee.email or "User").strip()
-    course_title = cycle.assignment.course_version.course.title
-    version = cycle.assignment.course_version.version
-
-    completed_at = localtime(cycle.completed_at)
-    expires_at = localtime(cycle.expires_at) if cycle.expires_at else None
-
-    # Build PDF (ReportLab)
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=landscape(letter))
-    width, height = landscape(letter)
-
-    margin = 0.5 * inch
-    c.setLineWidth(3)
-    c.rect(margin, margin, width - 2 * margin, height - 2 * margin)
+    pdf = certificate_pdf(cycle)
 
-    c.setFont("Helvetica-Bold", 34)
-    c.drawCentredString(width / 2, height - 1.35 * inch, "Certificate of Completion")
-
-    c.setFont("Helvetica", 16)
-    c.drawCentredString(width / 2, height - 1.7 * inch, "This certifies that")
-
-    c.setFont("Helvetica-Bold", 28)
-    c.drawCentredString(width / 2, height - 2.4 * inch, full_name)
-
-    c.setFont("Helvetica", 16)
-    c.drawCentredString(width / 2, height - 3.0 * inch, "has successfully completed")
-
-    c.setFont("Helvetica-Bold", 22)
-    c.drawCentredString(width / 2, height - 3.6 * inch, f"{course_title} (Version {version})")
-
-    completed_date = completed_at.date().strftime("%B %d, %Y")
-    expires_date = expires_at.date().strftime("%B %d, %Y") if expires_at else "—"
-
-    c.setFont("Helvetica", 14)
-    c.drawCentredString(width / 2, height - 4.3 * inch, f"Completed: {completed_date}    |    Expires: {expires_date}")
-
-    c.setFont("Helvetica", 12)
-    c.drawString(margin + 0.2 * inch, margin + 0.35 * inch, f"Certificate ID: {cycle.certificate_id}")
-
-    c.showPage()
-    c.save()
-
-    pdf = buffer.getvalue()
-    buffer.close()
-
-    resp = HttpResponse(pdf, content_type="application/pdf")
-    resp["Content-Disposition"] = f'attachment; filename="certificate-{cycle.certificate_id}.pdf"'
-    return resp
+    return FileResponse(
+        BytesIO(pdf),
+        as_attachment=True,
+        filename=f"certificate-{cycle.certificate_id}.pdf",
+        content_type="application/pdf",
+    )
@@ -1,10 +1,20 @@
 import os
 from django.contrib.auth import get_user_model
 
+# Set once this process has checked; wsgi.py calls bootstrap_admin() on every worker start
+_bootstrapped = False
+
+
 def bootstrap_admin():
-    username = os.getenv("admin")
-    email = os.getenv("jvanhook@integranethealth.com")
-    password = os.getenv("1913North!")
+    global _bootstrapped
+    if _bootstrapped:
+        return
+    _bootstrapped = True
+
+    # Same env vars as the bootstrap_admin management command
+    username = os.getenv("ADMIN_USERNAME", "").strip()
+    email = os.getenv("ADMIN_EMAIL", "").strip()
+    password = os.getenv("ADMIN_PASSWORD", "").strip()
 
     if not (username and password):
         return
@@ -13,4 +23,4 @@ def bootstrap_admin():
     if User.objects.filter(username=username).exists():
         return
 
-    User.objects.create_superuser(username=username, email=email or "", password=password)
+    User.objects.create_superuser(username=username, email=email, password=password)
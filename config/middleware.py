@@ -0,0 +1,42 @@
+# config/middleware.py
+import os
+from urllib.parse import urlparse
+
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+from whitenoise.responders import NotARegularFileError
+from whitenoise.string_utils import ensure_leading_trailing_slash
+
+
+class MediaWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise for /static/, plus MEDIA_ROOT under MEDIA_URL when SERVE_MEDIA is on.
+
+    Uploads land in MEDIA_ROOT while the process is running, so media is looked up
+    on disk per request instead of from the startup file index static files use.
+    """
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self.media_prefix = ensure_leading_trailing_slash(urlparse(settings.MEDIA_URL).path)
+        self.media_root = None
+        if settings.SERVE_MEDIA:
+            self.media_root = os.path.abspath(settings.MEDIA_ROOT).rstrip(os.path.sep) + os.path.sep
+
+    def __call__(self, request):
+        if self.media_root and request.path_info.startswith(self.media_prefix):
+            media_file = self.find_media_file(request.path_info)
+            if media_file is not None:
+                return self.serve(media_file, request)
+        return super().__call__(request)
+
+    def find_media_file(self, url):
+        if url.endswith("/") or not self.url_is_canonical(url):
+            return None
+        path = os.path.join(self.media_root, url[len(self.media_prefix):])
+        if not self.path_is_child_of(path, self.media_root):
+            return None
+        try:
+            return self.get_static_file(path, url)
+        except NotARegularFileError:
+            return None
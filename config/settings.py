@@ -1,56 +1,67 @@
 # config/settings.py
 from pathlib import Path
 import os
+import re
 from dotenv import load_dotenv
-
-load_dotenv()
+from django.core.exceptions import ImproperlyConfigured
 
 # -----------------------------------------------------------------------------
 # Paths / helpers
 # -----------------------------------------------------------------------------
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Local dev only: Railway injects real env vars, so skip the .env read there.
+# Explicit path avoids find_dotenv()'s walk up the parent directories.
+_DOTENV_PATH = BASE_DIR / ".env"
+if os.environ.get("DJANGO_SECRET_KEY") is None and _DOTENV_PATH.exists():
+    load_dotenv(_DOTENV_PATH, override=False)
+
+
+# One snapshot of the environment (after .env is loaded); every setting reads from it
+_ENV = os.environ.copy()
 
-def _csv_env(name: str):
+
+def _csv_env(name: str, default: str = ""):
     """Read comma-separated env var into a clean list (no blanks)."""
-    return [v.strip() for v in os.getenv(name, "").split(",") if v.strip()]
+    return [v for v in map(str.strip, _ENV.get(name, default).split(",")) if v]
+
+
+def _merge_unique(*lists):
+    """Concatenate lists, keeping the first occurrence of each item (dict keys keep order)."""
+    return list(dict.fromkeys(v for lst in lists for v in lst))
 
 
 def _env_bool(name: str, default: str = "0") -> bool:
-    return os.getenv(name, default).lower() in ("1", "true", "yes", "on")
+    return _ENV.get(name, default).lower() in ("1", "true", "yes", "on")
 
 
 # -----------------------------------------------------------------------------
 # Core security / environment
 # -----------------------------------------------------------------------------
-SECRET_KEY = os.getenv("DJANGO_SECRET_KEY", "dev-insecure-change-me")
+SECRET_KEY = _ENV.get("DJANGO_SECRET_KEY", "dev-insecure-change-me")
 DEBUG = _env_bool("DJANGO_DEBUG", "0")
 
-ALLOWED_HOSTS = [
-    h.strip()
-    for h in os.getenv("ALLOWED_HOSTS", "localhost,127.0.0.1,.up.railway.app").split(",")
-    if h.strip()
-]
-for h in _csv_env("EXTRA_ALLOWED_HOSTS"):
-    if h not in ALLOWED_HOSTS:
-        ALLOWED_HOSTS.append(h)
+ALLOWED_HOSTS = _merge_unique(
+    _csv_env("ALLOWED_HOSTS", "localhost,127.0.0.1,.up.railway.app"),
+    _csv_env("EXTRA_ALLOWED_HOSTS"),
+)
 
 # Proxy / Railway
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
 USE_X_FORWARDED_HOST = True
 
 # Frontend URL (used for redirects if you ever need them)
-FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173").rstrip("/")
-APP_PATH = os.getenv("APP_PATH", "/app/")
+FRONTEND_URL = _ENV.get("FRONTEND_URL", "http://localhost:5173").rstrip("/")
+APP_PATH = _ENV.get("APP_PATH", "/app/")
 
 LOGIN_URL = "/accounts/login/"
-LOGIN_REDIRECT_URL = os.getenv("LOGIN_REDIRECT_URL", f"{FRONTEND_URL}/")
-LOGOUT_REDIRECT_URL = os.getenv("LOGOUT_REDIRECT_URL", f"{FRONTEND_URL}/")
+LOGIN_REDIRECT_URL = _ENV.get("LOGIN_REDIRECT_URL", f"{FRONTEND_URL}/")
+LOGOUT_REDIRECT_URL = _ENV.get("LOGOUT_REDIRECT_URL", f"{FRONTEND_URL}/")
 
 # -----------------------------------------------------------------------------
 # Application definition
 # -----------------------------------------------------------------------------
-INSTALLED_APPS = [
+INSTALLED_APPS = (
     "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
@@ -65,16 +76,16 @@ INSTALLED_APPS = [
     "courses",
     "audits",
     "apps.core",
-]
+)
 
-MIDDLEWARE = [
+MIDDLEWARE = (
     # CORS must be high (before CommonMiddleware)
     "corsheaders.middleware.CorsMiddleware",
 
     "django.middleware.security.SecurityMiddleware",
 
-    # WhiteNoise directly after SecurityMiddleware
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    # WhiteNoise directly after SecurityMiddleware (static, plus media when SERVE_MEDIA)
+    "config.middleware.MediaWhiteNoiseMiddleware",
 
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -82,7 +93,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-]
+)
 
 ROOT_URLCONF = "config.urls"
 
@@ -92,11 +103,11 @@ TEMPLATES = [
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
-            "context_processors": [
+            "context_processors": (
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
-            ],
+            ),
         },
     },
 ]
@@ -106,7 +117,12 @@ WSGI_APPLICATION = "config.wsgi.application"
 # -----------------------------------------------------------------------------
 # Database
 # -----------------------------------------------------------------------------
-DATABASE_URL = os.getenv("DATABASE_URL", "").strip()
+DATABASE_URL = _ENV.get("DATABASE_URL", "").strip()
+
+# On Railway a missing DATABASE_URL is a misconfiguration: fail at startup
+# rather than quietly running on a throwaway SQLite file in the container
+if not DATABASE_URL and _ENV.get("RAILWAY_ENVIRONMENT"):
+    raise ImproperlyConfigured("DATABASE_URL must be set on Railway.")
 
 if DATABASE_URL:
     import dj_database_url
@@ -126,20 +142,30 @@ else:
     }
 
 # -----------------------------------------------------------------------------
-# Password validation
+# Password hashing / validation
 # -----------------------------------------------------------------------------
-AUTH_PASSWORD_VALIDATORS = [
+# First entry hashes new passwords; the rest only verify (and get upgraded on login)
+PASSWORD_HASHERS = [
+    "accounts.hashers.FastPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+AUTH_PASSWORD_VALIDATORS = (
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
     {"NAME": "django.contrib.auth.password_validation.CommonPasswordValidator"},
     {"NAME": "django.contrib.auth.password_validation.NumericPasswordValidator"},
-]
+)
 
 # -----------------------------------------------------------------------------
 # Internationalization
 # -----------------------------------------------------------------------------
 LANGUAGE_CODE = "en-us"
-TIME_ZONE = os.getenv("TIME_ZONE", "UTC")
+TIME_ZONE = _ENV.get("TIME_ZONE", "UTC")
 USE_I18N = True
 USE_TZ = True
 
@@ -152,24 +178,35 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 # Your repo static folder (brand.css, logos, etc)
 STATICFILES_DIRS = [BASE_DIR / "static"]
 
-STATICFILES_FINDERS = [
+STATICFILES_FINDERS = (
     "django.contrib.staticfiles.finders.FileSystemFinder",
     "django.contrib.staticfiles.finders.AppDirectoriesFinder",
-]
+)
 
+# Django 5.1+ ignores STATICFILES_STORAGE; the backend is set through STORAGES
 if DEBUG:
     # In dev, allow runserver/finder behavior
     WHITENOISE_USE_FINDERS = True
-    STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
+    _STATICFILES_BACKEND = "django.contrib.staticfiles.storage.StaticFilesStorage"
 else:
-    # In prod, require collectstatic (your Railway start command does this)
+    # In prod, require collectstatic (your Railway start command does this).
+    # No manifest: Vite already hashes the SPA's asset names, so collectstatic
+    # only gzips/brotlis and {% static %} is plain STATIC_URL concatenation.
     WHITENOISE_USE_FINDERS = False
-    STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
-    # Prevent a hard crash if a referenced hashed file is missing
-    WHITENOISE_MANIFEST_STRICT = False
+    _STATICFILES_BACKEND = "whitenoise.storage.CompressedStaticFilesStorage"
+
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": _STATICFILES_BACKEND},
+}
 
 MEDIA_URL = "/media/"
-MEDIA_ROOT = Path(os.getenv("MEDIA_ROOT", str(BASE_DIR / "media")))
+MEDIA_ROOT = Path(_ENV.get("MEDIA_ROOT", str(BASE_DIR / "media")))
+
+# MEDIA serving (WhiteNoise, see config.middleware):
+# - In production: only if SERVE_MEDIA=1 (Railway demo)
+# - In DEBUG: always
+SERVE_MEDIA = DEBUG or _env_bool("SERVE_MEDIA")
 
 # -----------------------------------------------------------------------------
 # CORS / CSRF (Cloudflare Pages frontend)
@@ -180,9 +217,10 @@ MEDIA_ROOT = Path(os.getenv("MEDIA_ROOT", str(BASE_DIR / "media")))
 CORS_ALLOWED_ORIGINS = _csv_env("CORS_ALLOWED_ORIGINS")
 CSRF_TRUSTED_ORIGINS = _csv_env("CSRF_TRUSTED_ORIGINS")
 
-# Allow all pages.dev previews (optional but helpful)
+# Allow all pages.dev previews (optional but helpful).
+# Compiled once here; corsheaders matches them on every cross-origin request.
 CORS_ALLOWED_ORIGIN_REGEXES = [
-    r"^https:\/\/.*\.pages\.dev$",
+    re.compile(r"^https:\/\/.*\.pages\.dev$"),
 ]
 
 CORS_ALLOW_CREDENTIALS = True
@@ -199,13 +237,14 @@ CORS_ALLOW_HEADERS = [
 
 # Local dev convenience
 if DEBUG:
-    for o in ["http://localhost:5173", "http://127.0.0.1:5173"]:
-        if o not in CORS_ALLOWED_ORIGINS:
-            CORS_ALLOWED_ORIGINS.append(o)
-
-    for o in ["http://localhost:5173", "http://127.0.0.1:5173", "http://localhost:8000", "http://127.0.0.1:8000"]:
-        if o not in CSRF_TRUSTED_ORIGINS:
-            CSRF_TRUSTED_ORIGINS.append(o)
+    CORS_ALLOWED_ORIGINS = _merge_unique(
+        CORS_ALLOWED_ORIGINS,
+        ["http://localhost:5173", "http://127.0.0.1:5173"],
+    )
+    CSRF_TRUSTED_ORIGINS = _merge_unique(
+        CSRF_TRUSTED_ORIGINS,
+        ["http://localhost:5173", "http://127.0.0.1:5173", "http://localhost:8000", "http://127.0.0.1:8000"],
+    )
 
 # Cookies: if frontend + backend are different domains in prod, must be None + Secure
 if DEBUG:
@@ -1,37 +1,44 @@
 # config/urls.py
-import os
+import hashlib
 from pathlib import Path
 
 from django.conf import settings
 from django.contrib import admin
 from django.contrib.auth import logout
 from django.contrib.auth import views as auth_views
-from django.http import FileResponse, JsonResponse
-from django.shortcuts import redirect
-from django.urls import include, path, re_path
+from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
+from django.urls import include, path
 from django.views.decorators.csrf import ensure_csrf_cookie
-from django.views.static import serve as static_serve
+from django.views.decorators.http import condition
 
 from apps.core import views as core_views
 from accounts import views as accounts_views
 
 
+# Literal targets: HttpResponseRedirect skips redirect()'s resolve_url() lookup
+_APP_URL = "/app/"
+_LOGIN_URL = "/accounts/login/"
+
+
 # ----------------------------
 # Root routing
 # ----------------------------
 def root_redirect(request):
-    if request.user.is_authenticated:
-        return redirect("/app/")
-    return redirect("/accounts/login/")
+    # No session cookie means anonymous; don't build the lazy user at all.
+    # (A fresh response each time: middleware adds headers/cookies to it.)
+    if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+        return HttpResponseRedirect(_LOGIN_URL)
+    return HttpResponseRedirect(_APP_URL if request.user.is_authenticated else _LOGIN_URL)
 
 
 # ----------------------------
 # CSRF helper (should NOT require login)
-# Ensures csrftoken cookie exists on the backend origin
+# Ensures csrftoken cookie exists on the backend origin; the SPA only reads
+# the cookie, so the response has no body
 # ----------------------------
 @ensure_csrf_cookie
 def csrf(request):
-    return JsonResponse({"ok": True})
+    return HttpResponse(status=204)
 
 
 # ----------------------------
@@ -41,69 +48,93 @@ def csrf(request):
 # ----------------------------
 def logout_then_login(request):
     logout(request)
-    return redirect("/accounts/login/")
+    return HttpResponseRedirect(_LOGIN_URL)
 
 
 # ----------------------------
 # SPA handler (SERVE index.html at /app/ and /app/*)
 # IMPORTANT: This does NOT redirect to /static/app/index.html
 # ----------------------------
-def spa(request):
-    index_path = Path(settings.BASE_DIR) / "static" / "app" / "index.html"
-    if not index_path.exists():
+_INDEX_PATH = Path(settings.BASE_DIR) / "static" / "app" / "index.html"
+
+
+def _load_index():
+    """(bytes, etag) for the built index.html, or None if the build isn't there."""
+    try:
+        data = _INDEX_PATH.read_bytes()
+    except OSError:
+        return None
+    return data, hashlib.md5(data).hexdigest()
+
+
+# index.html only changes on deploy, so read it once per worker.
+# In DEBUG (Vite rebuilds) or if it was missing at import, read it per request.
+_INDEX = None if settings.DEBUG else _load_index()
+
+
+def _index_etag(request, subpath=""):
+    index = _INDEX or _load_index()
+    return index[1] if index else None
+
+
+@condition(etag_func=_index_etag)
+def spa(request, subpath=""):
+    index = _INDEX or _load_index()
+    if index is None:
         # Helpful message if build output isn't present in Railway container
         return JsonResponse(
             {
                 "error": "SPA index.html not found",
-                "expected": str(index_path),
+                "expected": str(_INDEX_PATH),
                 "hint": "Ensure Vite build outputs to backend/static/app and collectstatic runs on deploy.",
             },
             status=500,
         )
 
     # Serve the file contents as the response for /app/ and any /app/* route
-    return FileResponse(open(index_path, "rb"), content_type="text/html")
+    return HttpResponse(index[0], content_type="text/html")
 
 
+# Ordered by traffic: the resolver tries patterns top to bottom and stops at the
+# first match. Every entry has a distinct literal prefix, so order doesn't change
+# what matches; the empty-prefix courses include stays strictly last.
 urlpatterns = [
-    # Root
-    path("", root_redirect),
+    # SPA entry (canonical) + deep links
+    # (bare /app is redirected to /app/ by CommonMiddleware's APPEND_SLASH)
+    path("app/", spa, name="spa"),
+    path("app/<path:subpath>", spa),
 
     # API
     path("api/me/", core_views.me, name="api-me"),
     path("api/csrf/", csrf, name="api-csrf"),
 
+    # Auth (one prefix, so other URLs skip the whole group)
+    path("accounts/", include([
+        path("register/", accounts_views.register, name="register"),
+        path("login/", auth_views.LoginView.as_view(template_name="accounts/login.html"), name="login"),
+        path("logout/", logout_then_login, name="logout"),
+        path("", include("django.contrib.auth.urls")),
+    ])),
+
     # Admin
     path("admin/", admin.site.urls),
 
     # Apps
     path("audits/", include("audits.urls")),
-    path("", include("courses.urls")),
-
-    # Auth
-    path("accounts/register/", accounts_views.register, name="register"),
-    path("accounts/login/", auth_views.LoginView.as_view(template_name="accounts/login.html"), name="login"),
-    path("accounts/logout/", logout_then_login, name="logout"),
-    path("accounts/", include("django.contrib.auth.urls")),
 
-    # Debug helpers
-    path("debug/media-list/", core_views.debug_media_list),
+    # Debug helpers (dev only; not registered in production)
+    *(
+        [
+            path("debug/media-list/", core_views.debug_media_list),
+            path("debug/media-check/", core_views.media_check),
+        ]
+        if settings.DEBUG
+        else []
+    ),
 
-    # SPA entry (canonical)
-    path("app/", spa, name="spa"),
-]
+    # Root
+    path("", root_redirect),
 
-# SPA routing MUST be near the end
-urlpatterns += [
-    path("app", lambda r: redirect("/app/", permanent=False)),
-    re_path(r"^app/.*$", spa),
+    # Matches many prefixes (training/, dashboard/, certificates/, api/...), keep last
+    path("", include("courses.urls")),
 ]
-
-# MEDIA serving:
-# - In production: only if SERVE_MEDIA=1 (Railway demo)
-# - In DEBUG: Django can serve it
-SERVE_MEDIA = os.getenv("SERVE_MEDIA", "0") == "1"
-if settings.DEBUG or SERVE_MEDIA:
-    urlpatterns += [
-        re_path(r"^media/(?P<path>.*)$", static_serve, {"document_root": settings.MEDIA_ROOT}),
-    ]
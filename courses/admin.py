@@ -1,7 +1,9 @@
 from django.contrib import admin
+from django.db.models import Q, Value
+from django.db.models.functions import Coalesce
 from django.utils.timezone import now
 from django.contrib.auth import get_user_model
-from courses.services import assign_required_company_courses, is_company_user
+from courses.services import COMPANY_DOMAIN, assign_required_company_courses_bulk, is_company_user
 
 from .models import (
     Course,
@@ -54,32 +56,28 @@ User = get_user_model()
 
 @admin.action(description="Assign required company courses to all company users")
 def assign_required_to_all_company_users(modeladmin, request, queryset):
-    # queryset is Courses selected, but we can just assign based on flags
-    company_users = User.objects.exclude(email="").iterator()
-    for u in company_users:
-        if is_company_user(u.email):
-            assign_required_company_courses(u)
+    # queryset is Courses selected, but we can just assign based on flags.
+    # The domain suffix narrows it in SQL; is_company_user() still has the final say.
+    company_users = (
+        User.objects
+        .filter(email__iendswith=f"@{COMPANY_DOMAIN}")
+        .only("id", "email")
+        .iterator(chunk_size=500)
+    )
+    assign_required_company_courses_bulk(u for u in company_users if is_company_user(u.email))
 # --------------------
 # Actions
 # --------------------
 
 @admin.action(description="Publish selected course versions (set published_at)")
 def publish_course_versions(modeladmin, request, queryset):
-    updated = 0
-    for cv in queryset:
-        changed = False
-
-        if not cv.is_published:
-            cv.is_published = True
-            changed = True
-
-        if cv.published_at is None:
-            cv.published_at = now()
-            changed = True
-
-        if changed:
-            cv.save(update_fields=["is_published", "published_at"])
-            updated += 1
+    # One UPDATE; only rows that actually change are touched (and counted),
+    # and an existing published_at is kept
+    updated = (
+        queryset
+        .filter(Q(is_published=False) | Q(published_at__isnull=True))
+        .update(is_published=True, published_at=Coalesce("published_at", Value(now())))
+    )
 
     modeladmin.message_user(request, f"Published {updated} course version(s).")
 
@@ -106,30 +104,26 @@ class CourseAdmin(admin.ModelAdmin):
 @admin.register(CourseVersion)
 class CourseVersionAdmin(admin.ModelAdmin):
     list_display = ("course", "version", "is_published", "published_at", "retired_at", "pass_score")
+    list_select_related = ("course",)
     search_fields = ("course__code", "course__title", "version")
     list_filter = ("is_published", "course__code")
     autocomplete_fields = ("course", "created_by")
     readonly_fields = ("created_at",)
     actions = (publish_course_versions, unpublish_course_versions)
 
-    fields = (
-        "course",
-        "version",
-        "changelog",
-        "video_file",
-        "pdf_file",
-        "pass_score",
-        "is_published",
-        "published_at",
-        "retired_at",
-        "created_by",
-        "created_at",
+    # Uploads and audit info are collapsed; the common edits are publish state and changelog
+    fieldsets = (
+        (None, {"fields": ("course", "version", "changelog", "pass_score")}),
+        ("Publication", {"fields": ("is_published", "published_at", "retired_at")}),
+        ("Files", {"classes": ("collapse",), "fields": ("video_file", "pdf_file")}),
+        ("Audit", {"classes": ("collapse",), "fields": ("created_by", "created_at")}),
     )
 
 
 @admin.register(Quiz)
 class QuizAdmin(admin.ModelAdmin):
     list_display = ("course_version", "is_required")
+    list_select_related = ("course_version__course",)
     list_filter = ("is_required", "course_version__course__code")
     search_fields = ("course_version__course__code", "course_version__course__title", "course_version__version")
     autocomplete_fields = ("course_version",)
@@ -139,19 +133,23 @@ class QuizAdmin(admin.ModelAdmin):
 @admin.register(QuizQuestion)
 class QuizQuestionAdmin(admin.ModelAdmin):
     list_display = ("quiz", "order", "short_prompt")
+    list_select_related = ("quiz",)
     list_filter = ("quiz__course_version__course__code",)
     search_fields = ("prompt",)
     ordering = ("quiz", "order", "id")
     autocomplete_fields = ("quiz",)
     inlines = (QuizChoiceInline,)
 
+    @admin.display(ordering="prompt")
     def short_prompt(self, obj):
-        return (obj.prompt[:60] + "…") if obj.prompt and len(obj.prompt) > 60 else (obj.prompt or "")
+        s = obj.prompt or ""
+        return f"{s[:60]}…" if len(s) > 60 else s
 
 
 @admin.register(QuizChoice)
 class QuizChoiceAdmin(admin.ModelAdmin):
     list_display = ("question", "text", "is_correct")
+    list_select_related = ("question",)
     list_filter = ("is_correct", "question__quiz__course_version__course__code")
     search_fields = ("text", "question__prompt")
     autocomplete_fields = ("question",)
@@ -160,6 +158,8 @@ class QuizChoiceAdmin(admin.ModelAdmin):
 @admin.register(Assignment)
 class AssignmentAdmin(admin.ModelAdmin):
     list_display = ("assignee", "course_version", "status", "assigned_at", "due_at")
+    list_select_related = ("assignee", "course_version__course")
+    list_per_page = 50
     list_filter = ("status", "course_version__course__code")
     search_fields = ("assignee__username", "assignee__email", "course_version__course__title", "course_version__version")
     autocomplete_fields = ("assignee", "course_version", "assigned_by")
@@ -168,6 +168,8 @@ class AssignmentAdmin(admin.ModelAdmin):
 @admin.register(AssignmentCycle)
 class AssignmentCycleAdmin(admin.ModelAdmin):
     list_display = ("assignment", "completed_at", "expires_at", "score", "passed", "certificate_id")
+    list_select_related = ("assignment__assignee", "assignment__course_version__course")
+    list_per_page = 50
     list_filter = ("passed", "assignment__course_version__course__code")
     search_fields = ("certificate_id", "assignment__assignee__username", "assignment__assignee__email")
     readonly_fields = ("certificate_id",)
@@ -176,6 +178,8 @@ class AssignmentCycleAdmin(admin.ModelAdmin):
 @admin.register(VideoProgress)
 class VideoProgressAdmin(admin.ModelAdmin):
     list_display = ("user", "course_version", "percent", "started_at", "completed_at", "last_ping_at")
+    list_select_related = ("user", "course_version__course")
+    list_per_page = 50
     list_filter = ("percent", "course_version__course__code")
     search_fields = ("user__username", "user__email", "course_version__course__title")
     autocomplete_fields = ("user", "course_version")
@@ -36,6 +36,16 @@ class Command(BaseCommand):
         cycles_qs = (
             AssignmentCycle.objects
             .select_related("assignment", "assignment__assignee", "assignment__course_version", "assignment__course_version__course")
+            # Only what the reminder email reads
+            .only(
+                "expires_at",
+                "reminder_30_sent_at",
+                "assignment__assignee__username",
+                "assignment__assignee__email",
+                "assignment__assignee__first_name",
+                "assignment__course_version__course__code",
+                "assignment__course_version__course__title",
+            )
             .filter(
                 expires_at__isnull=False,
                 expires_at__gt=now,
@@ -47,7 +57,7 @@ class Command(BaseCommand):
         if only_completed:
             cycles_qs = cycles_qs.filter(completed_at__isnull=False)
 
-        sent = 0
+        sent_ids = []
         for c in cycles_qs:
             u = c.assignment.assignee
             if not u.email:
@@ -69,11 +79,13 @@ class Command(BaseCommand):
                 self.stdout.write(f"[DRY] Would email {u.email}: {course_title} expires {c.expires_at}")
             else:
                 send_mail(subject, body, settings.DEFAULT_FROM_EMAIL, [u.email], fail_silently=False)
-                c.reminder_30_sent_at = now
-                c.save(update_fields=["reminder_30_sent_at"])
-                sent += 1
+                sent_ids.append(c.pk)
+
+        # One UPDATE for the whole batch; handle() is atomic, so a failed send rolls it all back
+        if sent_ids:
+            AssignmentCycle.objects.filter(pk__in=sent_ids).update(reminder_30_sent_at=now)
 
-        self.stdout.write(self.style.SUCCESS(f"Reminder emails sent: {sent}"))
+        self.stdout.write(self.style.SUCCESS(f"Reminder emails sent: {len(sent_ids)}"))
 
         # -------------------------
         # 2) Recurring assignments
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.10 on 2026-10-15 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0011_course_annual_renewal_course_required_for_company'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assignmentcycle',
+            index=models.Index(fields=['assignment', '-completed_at', 'expires_at'], name='cycle_completed_expires_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.10 on 2026-10-15 22:42
+
+from django.db import migrations, models
+
+
+def fill_certificate_text(apps, schema_editor):
+    """Backfill the certificate text for already-completed cycles (same rules as AssignmentCycle.fill_certificate_text)."""
+    AssignmentCycle = apps.get_model("courses", "AssignmentCycle")
+    cycles = (
+        AssignmentCycle.objects
+        .filter(completed_at__isnull=False)
+        .select_related("assignment__assignee", "assignment__course_version__course")
+    )
+    batch = []
+    for cycle in cycles.iterator(chunk_size=1000):
+        assignee = cycle.assignment.assignee
+        cv = cycle.assignment.course_version
+        full_name = f"{assignee.first_name} {assignee.last_name}".strip()
+        cycle.full_name_cached = (full_name or assignee.username or assignee.email or "User").strip()[:200]
+        cycle.course_title_cached = f"{cv.course.title} (Version {cv.version})"[:300]
+        batch.append(cycle)
+        if len(batch) >= 1000:
+            AssignmentCycle.objects.bulk_update(batch, ["full_name_cached", "course_title_cached"])
+            batch = []
+    AssignmentCycle.objects.bulk_update(batch, ["full_name_cached", "course_title_cached"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0012_assignmentcycle_completed_expires_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assignmentcycle',
+            name='course_title_cached',
+            field=models.CharField(blank=True, editable=False, max_length=300),
+        ),
+        migrations.AddField(
+            model_name='assignmentcycle',
+            name='full_name_cached',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.RunPython(fill_certificate_text, migrations.RunPython.noop),
+    ]
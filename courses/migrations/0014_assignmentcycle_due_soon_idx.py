@@ -0,0 +1,17 @@
+# Generated by Django 5.2.10 on 2026-10-15 22:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0013_assignmentcycle_certificate_text'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assignmentcycle',
+            index=models.Index(condition=models.Q(('reminder_30_sent_at__isnull', True)), fields=['expires_at'], name='cycle_due_soon_idx'),
+        ),
+    ]
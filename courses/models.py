@@ -169,6 +169,11 @@ class AssignmentCycle(models.Model):
 
     certificate_id = models.CharField(max_length=32, unique=True, editable=False)
 
+    # Certificate text, captured on completion so a download doesn't have to
+    # join the user and course tables
+    full_name_cached = models.CharField(max_length=200, blank=True, editable=False)
+    course_title_cached = models.CharField(max_length=300, blank=True, editable=False)  # "Title (Version N)"
+
     reminder_30_sent_at = models.DateTimeField(null=True, blank=True)
     reminder_7_sent_at = models.DateTimeField(null=True, blank=True)
 
@@ -177,6 +182,17 @@ class AssignmentCycle(models.Model):
         permissions = [
             ("can_audit_certs", "Can search and download certificates for all users"),
         ]
+        indexes = [
+            # Newest cycle per assignment (audit_center's latest-cycle subqueries)
+            models.Index(fields=["assignment", "-completed_at", "expires_at"], name="cycle_completed_expires_idx"),
+            # Cycles still owed an expiry reminder (run_scheduled_jobs' "due soon"
+            # range scan); rows leave the index once they've been reminded
+            models.Index(
+                fields=["expires_at"],
+                condition=models.Q(reminder_30_sent_at__isnull=True),
+                name="cycle_due_soon_idx",
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         is_new = self.pk is None
@@ -184,12 +200,26 @@ class AssignmentCycle(models.Model):
         if is_new and not self.certificate_id:
             self.certificate_id = uuid.uuid4().hex[:10]
 
-        # Only set expires_at when a completion exists
-        if self.completed_at and not self.expires_at:
-            self.expires_at = self.completed_at + relativedelta(months=11)
+        # Defaults below only apply to full saves: a partial save (update_fields)
+        # wouldn't persist them, and reading completed_at/expires_at/full_name_cached
+        # on a deferred (.only()) instance would cost a query each
+        if kwargs.get("update_fields") is None:
+            # Only set expires_at when a completion exists
+            if self.completed_at and not self.expires_at:
+                self.expires_at = self.completed_at + relativedelta(months=11)
+
+            if self.completed_at and not self.full_name_cached:
+                self.fill_certificate_text()
 
         super().save(*args, **kwargs)
 
+    def fill_certificate_text(self):
+        """Set full_name_cached / course_title_cached from the assignee and course version."""
+        assignee = self.assignment.assignee
+        cv = self.assignment.course_version
+        self.full_name_cached = (assignee.get_full_name() or assignee.username or assignee.email or "User").strip()[:200]
+        self.course_title_cached = f"{cv.course.title} (Version {cv.version})"[:300]
+
     @property
     def days_remaining(self):
         if not self.expires_at:
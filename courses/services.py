@@ -1,7 +1,7 @@
 # courses/services.py
+from django.contrib.auth import get_user_model
 from django.db import transaction
-from django.utils import timezone
-from courses.models import Course, CourseVersion, Assignment
+from courses.models import CourseVersion, Assignment
 
 COMPANY_DOMAIN = "integranethealth.com"
 
@@ -10,30 +10,69 @@ def is_company_user(email: str) -> bool:
         return False
     return email.split("@", 1)[1].lower() == COMPANY_DOMAIN
 
+def _required_course_version_ids():
+    """
+    Latest published CourseVersion id of every active required course, in one query
+    (same pick as before: newest published_at, then highest id).
+    """
+    latest = {}
+    versions = (
+        CourseVersion.objects
+        .filter(course__is_active=True, course__required_for_company=True, is_published=True)
+        .order_by("course_id", "-published_at", "-id")
+        .values_list("course_id", "id")
+    )
+    for course_id, cv_id in versions:
+        latest.setdefault(course_id, cv_id)
+    return list(latest.values())
+
+
 @transaction.atomic
-def assign_required_company_courses(user):
+def assign_required_company_courses_bulk(users, batch_size=1000):
     """
-    Assign required courses to a user (only if not already assigned).
-    Uses latest published CourseVersion.
+    Assign required courses to many users (only where not already assigned).
+    Uses latest published CourseVersion. Returns the number of assignments created.
     """
-    required_courses = Course.objects.filter(is_active=True, required_for_company=True)
-
-    for course in required_courses:
-        cv = (
-            CourseVersion.objects
-            .filter(course=course, is_published=True)
-            .order_by("-published_at", "-id")
-            .first()
+    cv_ids = _required_course_version_ids()
+    if not cv_ids:
+        return 0
+
+    created = 0
+    user_ids = [u.pk for u in users]
+    for start in range(0, len(user_ids), batch_size):
+        chunk = user_ids[start:start + batch_size]
+
+        # Lock these users' rows first so concurrent runs (a registration and the
+        # admin action, or a retried registration) take turns through the check
+        # below instead of both inserting. There's no unique constraint to fall
+        # back on: renewals deliberately add a second Assignment per user+version.
+        locked = (
+            get_user_model().objects
+            .select_for_update()
+            .filter(pk__in=chunk)
+            .order_by("pk")
+            .values_list("pk", flat=True)
         )
-        if not cv:
-            continue
+        list(locked)
 
         # avoid duplicates: only one active assignment per user+course_version
-        Assignment.objects.get_or_create(
-            assignee=user,
-            course_version=cv,
-            defaults={
-                "assigned_at": timezone.now(),
-                "status": Assignment.Status.ASSIGNED,
-            }
+        existing = set(
+            Assignment.objects
+            .filter(assignee_id__in=chunk, course_version_id__in=cv_ids)
+            .values_list("assignee_id", "course_version_id")
         )
+        new = [
+            Assignment(assignee_id=uid, course_version_id=cv_id, status=Assignment.Status.ASSIGNED)
+            for uid in chunk
+            for cv_id in cv_ids
+            if (uid, cv_id) not in existing
+        ]
+        # Every row is inserted (no silently skipped conflicts), so this count is exact
+        Assignment.objects.bulk_create(new, batch_size=batch_size)
+        created += len(new)
+    return created
+
+
+def assign_required_company_courses(user):
+    """Assign required courses to a single user (see assign_required_company_courses_bulk)."""
+    return assign_required_company_courses_bulk([user])
@@ -1,3 +1,130 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+from django.utils.timezone import now
+
+from accounts.models import UserProfile
+from courses.models import Assignment, AssignmentCycle, Course, CourseVersion
+
+User = get_user_model()
+
+
+class DownloadCertificateQueryCountTests(TestCase):
+    """The legacy courses download serves the same cached PDF as the audits one."""
+
+    @classmethod
+    def setUpTestData(cls):
+        course = Course.objects.create(code="HIPAA", title="HIPAA Basics")
+        cv = CourseVersion.objects.create(course=course, version="2026.01", is_published=True)
+        cls.owner = User.objects.create_user(username="owner", first_name="Pat", last_name="Lee")
+        cls.manager = User.objects.create_user(username="manager")
+        cls.stranger = User.objects.create_user(username="stranger")
+        UserProfile.objects.create(user=cls.owner, manager=cls.manager)
+        a = Assignment.objects.create(assignee=cls.owner, course_version=cv)
+        cls.cycle = AssignmentCycle.objects.create(assignment=a, completed_at=now(), passed=True)
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("download_certificate", args=[self.cycle.certificate_id])
+
+    def download(self):
+        resp = self.client.get(self.url)
+        if resp.status_code == 200:
+            b"".join(resp.streaming_content)
+        return resp
+
+    def test_cycle_has_certificate_text(self):
+        self.assertEqual(self.cycle.full_name_cached, "Pat Lee")
+        self.assertEqual(self.cycle.course_title_cached, "HIPAA Basics (Version 2026.01)")
+
+    def test_owner_download_query_count(self):
+        # session + user + one cycle lookup
+        self.client.force_login(self.owner)
+        with self.assertNumQueries(3):
+            resp = self.download()
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp["Content-Type"], "application/pdf")
+
+    def test_manager_download_query_count(self):
+        # + one EXISTS on UserProfile
+        self.client.force_login(self.manager)
+        with self.assertNumQueries(4):
+            self.assertEqual(self.download().status_code, 200)
+
+    def test_stranger_gets_404(self):
+        self.client.force_login(self.stranger)
+        self.assertEqual(self.download().status_code, 404)
+
+
+class AssignmentCycleSaveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        course = Course.objects.create(code="HIPAA", title="HIPAA Basics")
+        cv = CourseVersion.objects.create(course=course, version="2026.01", is_published=True)
+        owner = User.objects.create_user(username="owner", first_name="Pat", last_name="Lee")
+        a = Assignment.objects.create(assignee=owner, course_version=cv)
+        cls.cycle = AssignmentCycle.objects.create(assignment=a, completed_at=now(), passed=True)
+
+    def test_full_save_fills_defaults(self):
+        self.assertIsNotNone(self.cycle.expires_at)
+        self.assertEqual(self.cycle.full_name_cached, "Pat Lee")
+
+    def test_partial_save_of_deferred_instance_is_one_update(self):
+        AssignmentCycle.objects.filter(pk=self.cycle.pk).update(expires_at=None, full_name_cached="")
+        c = AssignmentCycle.objects.only("reminder_30_sent_at").get(pk=self.cycle.pk)
+        c.reminder_30_sent_at = now()
+        with self.assertNumQueries(1):
+            c.save(update_fields=["reminder_30_sent_at"])
+        # ...and leaves the fields it isn't writing alone
+        self.cycle.refresh_from_db()
+        self.assertIsNone(self.cycle.expires_at)
+        self.assertEqual(self.cycle.full_name_cached, "")
+
+
+class RunScheduledJobsQueryCountTests(TestCase):
+    """Expiry reminders: one SELECT for the due cycles, one UPDATE to mark them sent."""
+
+    # savepoint + due-cycle SELECT + UPDATE + active-rules SELECT + release
+    QUERIES = 5
+
+    @classmethod
+    def setUpTestData(cls):
+        course = Course.objects.create(code="HIPAA", title="HIPAA Basics")
+        cls.cv = CourseVersion.objects.create(course=course, version="2026.01", is_published=True)
+
+    def make_due_soon(self, n, start=0):
+        for i in range(start, start + n):
+            user = User.objects.create_user(username=f"user{i}", email=f"user{i}@example.com")
+            a = Assignment.objects.create(assignee=user, course_version=self.cv)
+            AssignmentCycle.objects.create(
+                assignment=a, completed_at=now(), expires_at=now() + timedelta(days=10), passed=True,
+            )
+
+    def run_jobs(self):
+        call_command("run_scheduled_jobs", stdout=StringIO())
+
+    def test_reminder_query_count_does_not_grow_with_cycles(self):
+        self.make_due_soon(2)
+        with self.assertNumQueries(self.QUERIES):
+            self.run_jobs()
+        self.assertEqual(len(mail.outbox), 2)
+
+        self.make_due_soon(10, start=2)
+        mail.outbox = []
+        with self.assertNumQueries(self.QUERIES):
+            self.run_jobs()
+        self.assertEqual(len(mail.outbox), 10)
+        self.assertFalse(AssignmentCycle.objects.filter(reminder_30_sent_at__isnull=True).exists())
 
-# Create your tests here.
+    def test_reminders_are_not_resent(self):
+        self.make_due_soon(3)
+        self.run_jobs()
+        mail.outbox = []
+        self.run_jobs()
+        self.assertEqual(mail.outbox, [])
@@ -1,8 +1,6 @@
 from django.urls import path
 from . import views
 from .views import dashboard, complete_course_version, download_certificate
-import os
-from django.conf import settings
 
 urlpatterns = [
     path("training/<int:course_version_id>/", views.my_training, name="my_training"),
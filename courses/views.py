@@ -1,16 +1,15 @@
-import os
 from io import BytesIO
 import logging
 import traceback
 from dateutil.relativedelta import relativedelta
 
-from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
 from django.db.models import Prefetch
 from django.http import (
+    FileResponse,
     Http404,
-    HttpResponse,
     HttpResponseForbidden,
     JsonResponse,
     HttpResponseNotAllowed,
@@ -20,9 +19,8 @@ from django.utils import timezone
 from django.utils.timezone import now, localtime
 from django.views.decorators.http import require_POST, require_GET
 
-from reportlab.lib.pagesizes import letter, landscape
-from reportlab.lib.units import inch
-from reportlab.pdfgen import canvas
+from accounts.models import UserProfile
+from audits.certificates import certificate_cycles, certificate_pdf, prerender_certificate
 
 from .models import (
     Assignment,
@@ -183,10 +181,11 @@ def complete_course_version(request, course_version_id: int):
         return redirect("take_quiz", course_version_id=cv.id)
 
     # Create completion cycle (history preserved)
-    AssignmentCycle.objects.create(
+    completed_at = now()
+    cycle = AssignmentCycle.objects.create(
         assignment=assignment,
-        completed_at=now(),
-        expires_at=now() + relativedelta(months=11),
+        completed_at=completed_at,
+        expires_at=completed_at + relativedelta(months=11),
         passed=True,
         score=quiz_score if quiz_required else None,
         # certificate_id auto-generated by AssignmentCycle.save()
@@ -195,6 +194,9 @@ def complete_course_version(request, course_version_id: int):
     assignment.status = Assignment.Status.COMPLETED
     assignment.save(update_fields=["status"])
 
+    # Render the certificate in the background so the first download is a cache hit
+    transaction.on_commit(lambda: prerender_certificate(cycle.pk))
+
     # Clear quiz session state
     request.session.pop(f"quiz_score_cv_{cv.id}", None)
     request.session.pop(f"quiz_passed_cv_{cv.id}", None)
@@ -212,111 +214,39 @@ def complete_course_version(request, course_version_id: int):
 @login_required
 def download_certificate(request, certificate_id: str):
     """
-    Generates a PDF certificate for the given certificate_id.
+    Serves the PDF certificate for the given certificate_id (same PDF as the audits download).
     Access: owner OR staff OR manager OR courses.can_audit_certs
     """
     try:
-        cycle = (
-            AssignmentCycle.objects
-            .select_related(
-                "assignment",
-                "assignment__assignee",
-                "assignment__course_version",
-                "assignment__course_version__course",
-            )
-            .get(certificate_id=certificate_id)
-        )
+        cycle = certificate_cycles().get(certificate_id=certificate_id)
     except AssignmentCycle.DoesNotExist:
         raise Http404("Certificate not found")
 
     if not cycle.completed_at:
         raise Http404("Certificate not available")
 
-    assignee = cycle.assignment.assignee
-
-    is_owner = assignee.id == request.user.id
-    is_staff = request.user.is_staff or request.user.is_superuser
-    has_audit_perm = request.user.has_perm("courses.can_audit_certs")
+    assignee_id = cycle.assignment.assignee_id
 
-    is_manager = False
-    try:
-        is_manager = assignee.userprofile.manager_id == request.user.id
-    except Exception:
-        is_manager = False
+    def is_manager():
+        # One EXISTS probe on the unique user_id index (OneToOne) instead of loading the profile
+        return UserProfile.objects.filter(user_id=assignee_id, manager_id=request.user.id).exists()
 
-    if not (is_owner or is_staff or is_manager or has_audit_perm):
+    # Cheapest checks first: the manager lookup and has_perm() both hit the DB
+    if not (
+        request.user.is_staff
+        or request.user.is_superuser
+        or assignee_id == request.user.id
+        or is_manager()
+        or request.user.has_perm("courses.can_audit_certs")
+    ):
         raise Http404("Not found")
 
-    # Build PDF
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=landscape(letter))
-    width, height = landscape(letter)
-
-    margin = 0.5 * inch
-    c.setLineWidth(3)
-    c.rect(margin, margin, width - 2 * margin, height - 2 * margin)
-
-    logo_path = os.path.join(settings.BASE_DIR, "media", "branding", "integra_logo.png")
-    if os.path.exists(logo_path):
-        c.drawImage(
-            logo_path,
-            margin + 0.05 * inch,
-            height - 1.25 * inch,
-            width=2.1 * inch,
-            height=0.75 * inch,
-            preserveAspectRatio=True,
-            mask="auto",
-        )
-
-    c.setFont("Helvetica-Bold", 34)
-    c.drawCentredString(width / 2, height - 1.35 * inch, "Certificate of Completion")
-
-    c.setFont("Helvetica", 16)
-    c.drawCentredString(width / 2, height - 1.7 * inch, "This certifies that")
-
-    full_name = assignee.get_full_name() or assignee.username
-    c.setFont("Helvetica-Bold", 28)
-    c.drawCentredString(width / 2, height - 2.4 * inch, full_name)
-
-    course_title = cycle.assignment.course_version.course.title
-    version = cycle.assignment.course_version.version
-
-    c.setFont("Helvetica", 16)
-    c.drawCentredString(width / 2, height - 3.0 * inch, "has successfully completed")
-
-    c.setFont("Helvetica-Bold", 22)
-    c.drawCentredString(width / 2, height - 3.6 * inch, f"{course_title} (Version {version})")
-
-    completed_date = localtime(cycle.completed_at).date().strftime("%B %d, %Y")
-    expires_date = localtime(cycle.expires_at).date().strftime("%B %d, %Y") if cycle.expires_at else "N/A"
-
-    c.setFont("Helvetica", 14)
-    c.drawCentredString(width / 2, height - 4.3 * inch, f"Completed: {completed_date}    |    Expires: {expires_date}")
-
-    c.setFont("Helvetica", 12)
-    c.drawString(margin + 0.2 * inch, margin + 0.35 * inch, f"Certificate ID: {cycle.certificate_id}")
-
-    c.setLineWidth(1)
-    left_x1, left_x2 = width * 0.18, width * 0.45
-    right_x1, right_x2 = width * 0.55, width * 0.82
-    sig_y = margin + 1.2 * inch
-
-    c.line(left_x1, sig_y, left_x2, sig_y)
-    c.line(right_x1, sig_y, right_x2, sig_y)
-
-    c.setFont("Helvetica", 12)
-    c.drawCentredString((left_x1 + left_x2) / 2, sig_y - 0.25 * inch, "Training Administrator")
-    c.drawCentredString((right_x1 + right_x2) / 2, sig_y - 0.25 * inch, completed_date)
-
-    c.showPage()
-    c.save()
-
-    pdf = buffer.getvalue()
-    buffer.close()
-
-    resp = HttpResponse(pdf, content_type="application/pdf")
-    resp["Content-Disposition"] = f'attachment; filename="certificate_{cycle.certificate_id}.pdf"'
-    return resp
+    return FileResponse(
+        BytesIO(certificate_pdf(cycle)),
+        as_attachment=True,
+        filename=f"certificate_{cycle.certificate_id}.pdf",
+        content_type="application/pdf",
+    )
 
 
 # -------------------------------------------------------------------